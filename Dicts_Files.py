@@ -62,6 +62,59 @@ hash['word'] = 'garfield'
 hash['count'] = 42
 s = 'I want %(count)d copies of %(word)s' % hash  # %d for int, %s for string
 print(s)# 'I want 42 copies of garfield'
+# to fill in the same template for many dicts, build all the strings and join them into one output (or write them to a file in one writelines() call),
+# instead of formatting and printing one dict at a time.
+def render_rows(template, rows, sep='\n'):
+    return sep.join(template % row for row in rows)
+
+## Writes one filled-in template per line to an open file f
+def write_rows(template, rows, f):
+    f.writelines(template % row + '\n' for row in rows)
+
+# when the data comes as columns (one list per name) there is no need to build a dict per row at all.
+# compile_template() looks at the template once and turns each %(name) into a plain positional % (keeping '%%' as it is),
+# so each row is just the tuple of values that zip() gives, in the order of the names.
+# like % itself, a key runs up to its matching ')', so '%(a(b))s' uses the name 'a(b)'; a key with no closing ')' is a ValueError.
+## Returns the positional template and the list of names it needs, in order
+def compile_template(template):
+    names = []
+    parts = []
+    copied = 0  ## template[:copied] is already in parts
+    i = template.find('%')
+    while i != -1:
+        if template[i + 1:i + 2] != '(':  ## '%%' or a positional spec: skip the % and the char after it
+            i = template.find('%', i + 2)
+            continue
+        depth = 1
+        end = i + 2
+        while depth and end < len(template):
+            if template[end] == '(':
+                depth += 1
+            elif template[end] == ')':
+                depth -= 1
+            end += 1
+        if depth:
+            raise ValueError('incomplete format key at index %d of %r' % (i, template))
+        names.append(template[i + 2:end - 1])
+        parts.append(template[copied:i + 1])
+        copied = end
+        i = template.find('%', end)
+    parts.append(template[copied:])
+    return ''.join(parts), names
+
+# all the columns must have the same length: a short one is a ValueError, not a silently shorter output.
+def render_columns(template, columns, sep='\n'):
+    positional, names = compile_template(template)
+    if not names:  ## a template without fields still gives one line per row
+        rows = {len(column) for column in columns.values()}
+        if len(rows) > 1:
+            raise ValueError('columns have different lengths: %s' % sorted(rows))
+        return sep.join([positional % ()] * (rows.pop() if rows else 0))
+    return sep.join(positional % values for values in zip(*[columns[name] for name in names], strict=True))
+print(render_rows('I want %(count)d copies of %(word)s', [hash, {'count': 1, 'word': 'odie'}]))
+print(render_columns('I want %(count)d copies of %(word)s', {'word': ['garfield', 'odie'], 'count': [42, 1]}))
+## I want 42 copies of garfield
+## I want 1 copies of odie
 
 #                                                               Del
 # the "del" operator does deletions.
@@ -80,21 +133,117 @@ del dict['b']  ## Delete 'b' entry
 print(dict)  ## {'a':1, 'c':3}
 
 #                                                               Files
+import array
+import itertools
+import operator
+import sys
 # the open() function opens and returns a file handle that can be used to read or write a file in the usual way
 # the code f = open('name', 'r') opens the file into the variable f, ready for reading operations, and use f.close() when finished.
 # instead of 'r', use 'w' for writing, and 'a' for append
 # the standard for-loop works for text files, iterating through the lines of the file (this works only for text files, not binary files).
 # the for-loop technique is a simple and efficient way to look at all the lines in a text file:
+# the old 'rU' (universal newlines) mode is gone in python 3 -- plain 'r' already turns '\r\n' and '\r' line endings into '\n'.
+# the buffering= argument sets how many bytes are read from the disk at a time; a bigger buffer means fewer, larger reads.
+# the gzip and bz2 modules open compressed files, and in 'rt' mode they hand back lines of text just like open().
+from word_count import open_text, iter_lines  ## defined in word_count.py, see the Word Count section below
+
 # Echo the contents of a file
-f = open('foo.txt', 'rU')
-for line in f:  ## iterates over the lines of the file
-    print(line,)  ## trailing , so print does not add an end-of-line char
-    ## since 'line' already includes the end-of-line.
-f.close()
+# calling print() once per line is slow for big files; sys.stdout.writelines() passes all the lines to one buffered writer instead.
+# the lines already include the end-of-line, so nothing is added between them.
+sys.stdout.writelines(iter_lines('foo.txt'))
 # reading one line at a time has the nice quality that not all the file needs to fit in memory at one time -- handy if you want to look at every line in a 10 gigabyte file without using 10 gigabytes of memory.
 # the f.readlines() method reads the whole file into memory and returns its contents as a list of its lines.
 # the f.read() method reads the whole file into a single string, which can be a handy way to deal with the text all at once, such as with regular expressions we'll see later.
 
+#                                                               Word Count
+# dicts are the natural way to count things: the word is the key and its count is the value.
+# collections.Counter is a dict made for this -- a missing key counts as 0, and update() adds 1 for every item in a list.
+# reading the file line by line with iter_lines() means only the counts are kept in memory, not the file.
+# the helpers are defined in word_count.py, a module with no top-level code, so that the worker processes of word_counts_many() can import them.
+# for the same reason a script that calls word_counts_many() should keep its own top-level code under if __name__ == '__main__':
+from word_count import word_counts, word_counts_many, top_words, save_counts, load_counts
+
+#                                                               Compact Dicts (optional)
+# every dict entry costs a hash table slot plus a separate str object for its key and for its value -- well over 100 bytes for short strings.
+# for tens of millions of short strings that overhead is most of the memory used.
+# a more compact layout packs all the keys into one long string and all the values into another, and keeps the start offset of each one in an array.
+# with the keys in sorted order, a lookup is a binary search over those offsets instead of a hash lookup.
+# the price is speed: each step of the search slices a key out of the long string in python, so with 300,000 keys get() takes
+## about 10 microseconds against about 0.25 for a dict -- some 40 times slower. Use it when memory, not lookup time, is the limit.
+# the long strings also use the widest character any key (or value) needs: all-ASCII/Latin-1 text takes 1 byte per char,
+## but a single key with e.g. a Chinese or emoji char makes every char of all the keys take 2 or 4 bytes
+## (in one measurement going from about 31 to about 39 bytes per entry).
+# the table is built once and is read-only afterwards.
+class CompactDict:
+    ## items is any iterable of (key, value) string pairs; for repeated keys the last value wins, as with a dict
+    def __init__(self, items):
+        pairs = []
+        for key, value in sorted(items, key=operator.itemgetter(0)):  ## stable, so repeated keys stay in insertion order
+            if pairs and pairs[-1][0] == key:
+                pairs[-1] = (key, value)
+            else:
+                pairs.append((key, value))
+        self.key_text = ''.join(key for key, value in pairs)
+        self.value_text = ''.join(value for key, value in pairs)
+        self.key_starts = array.array('q', itertools.accumulate((len(key) for key, value in pairs), initial=0))
+        self.value_starts = array.array('q', itertools.accumulate((len(value) for key, value in pairs), initial=0))
+
+    def key_at(self, i):
+        return self.key_text[self.key_starts[i]:self.key_starts[i + 1]]
+
+    def value_at(self, i):
+        return self.value_text[self.value_starts[i]:self.value_starts[i + 1]]
+
+    ## Index of key in the sorted keys, or -1 if it is not there
+    def find(self, key):
+        if not isinstance(key, str):  ## only str keys are stored; comparing them with another type would raise TypeError
+            return -1
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.key_at(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self) and self.key_at(lo) == key:
+            return lo
+        return -1
+
+    def __len__(self):
+        return len(self.key_starts) - 1
+
+    def __contains__(self, key):
+        return self.find(key) != -1
+
+    def __getitem__(self, key):
+        i = self.find(key)
+        if i == -1:
+            raise KeyError(key)
+        return self.value_at(i)
+
+    def get(self, key, default=None):
+        i = self.find(key)
+        return default if i == -1 else self.value_at(i)
+
+    ## keys, values and items always come out in sorted key order, no sorted() needed
+    def __iter__(self):
+        return self.keys()
+
+    def keys(self):
+        return (self.key_at(i) for i in range(len(self)))
+
+    def values(self):
+        return (self.value_at(i) for i in range(len(self)))
+
+    def items(self):
+        return ((self.key_at(i), self.value_at(i)) for i in range(len(self)))
+
+compact = CompactDict([('o', 'omega'), ('a', 'alpha'), ('g', 'gamma')])
+print(compact['a'], 'g' in compact, compact.get('z'))  ## alpha True None
+for k, v in compact.items(): print(k, '>', v)
+## a > alpha    g > gamma     o > omega
+
+
 
 
 
@@ -11,13 +11,170 @@
 # os.path.exists(path) -- true if it exists
 # os.mkdir(dir_path) -- makes one dir, os.makedirs(dir_path) makes all the needed dirs in this path
 # shutil.copy(source-path, dest-path) -- copy a file (dest path directories should exist)
+# entries = os.scandir(dir) -- like os.listdir(), but gives DirEntry objects: entry.name is the filename, entry.path is os.path.join(dir, entry.name),
+## and entry.is_dir(), entry.is_file() and entry.stat() reuse what the directory listing already returned, so they often need no extra system call.
 ## Example pulls filenames from a dir, prints their relative and absolute paths
+import concurrent.futures
+import os
 def printdir(dir):
-  random_filename = os.listdir(dir)
-  for random_filename in filenames:
-    print(random_filename)  ## foo.txt
-    print(os.path.join(dir, random_filename))## dir/foo.txt (relative to current dir)
-    print(os.path.abspath(os.path.join(dir, random_filename))) ## /home/nick/dir/foo.txt
+  with os.scandir(dir) as entries:
+    for entry in entries:
+      print(entry.name)  ## foo.txt
+      print(entry.path)  ## dir/foo.txt (relative to current dir)
+      print(os.path.abspath(entry.path)) ## /home/nick/dir/foo.txt
+
+# for a whole tree of directories, each directory can be listed on its own thread: the time goes into waiting for the disk, not the CPU.
+## Lists one directory: returns its files as (path, size, mtime) tuples, the paths of its subdirectories, and the paths of its symlinks.
+## mtime is st_mtime_ns (nanoseconds), which compares exactly, unlike the float st_mtime.
+## Raises OSError if the directory can't be listed (no permission, removed meanwhile, volume not mounted ...).
+def scan_dir(dir):
+  files = []
+  subdirs = []
+  links = []
+  with os.scandir(dir) as entries:
+    for entry in entries:
+      if entry.is_dir(follow_symlinks=False):
+        subdirs.append(entry.path)
+      elif entry.is_file(follow_symlinks=False):
+        st = entry.stat(follow_symlinks=False)
+        files.append((entry.path, st.st_size, st.st_mtime_ns))
+      elif entry.is_symlink():
+        links.append(entry.path)
+  return files, subdirs, links
+
+## Yields (path, size, mtime) for every file under dir, subdirectories included, in no particular order.
+## Each subdirectory is handed to the thread pool as soon as it is found.
+## If dir itself can't be listed, the OSError is raised. For a subdirectory that can't be listed, the error is raised too,
+## unless an errors list is given: then (subdir, exception) is appended to it and the walk goes on without that subdirectory.
+def walk_files(dir, workers=8, errors=None):
+  with concurrent.futures.ThreadPoolExecutor(workers) as pool:
+    pending = {pool.submit(scan_dir, dir): dir}
+    while pending:
+      done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+      for future in done:
+        path = pending.pop(future)
+        try:
+          files, subdirs, links = future.result()
+        except OSError as e:
+          if path == dir or errors is None:
+            raise
+          errors.append((path, e))
+          continue
+        for file in files:
+          yield file
+        for subdir in subdirs:
+          pending[pool.submit(scan_dir, subdir)] = subdir
+
+# the index can be written to a file as it is produced (one "size<tab>mtime<tab>path" line per file), so it never has to fit in memory,
+# and read back later as a dict of path -> (size, mtime).
+def save_index(files, filename):
+  with open(filename, 'w') as f:
+    f.writelines('%d\t%d\t%s\n' % (size, mtime, path) for path, size, mtime in files)
+
+def load_index(filename):
+  index = {}
+  with open(filename) as f:
+    for line in f:
+      size, mtime, path = line.rstrip('\n').split('\t', 2)
+      index[path] = (int(size), int(mtime))
+  return index
+
+## Brings an index of dir up to date, and returns the lists of new/changed and removed paths, and the (subdir, exception)
+## list of subdirectories that could not be listed.
+## Files whose size and mtime are the same as in the index are taken as unchanged.
+## A listing error is not a removal: if dir itself can't be listed the OSError is raised and the index is left alone,
+## and the entries under a subdirectory that can't be listed are kept as they were.
+def refresh_index(index, dir, workers=8):
+  changed = []
+  seen = set()
+  errors = []
+  for path, size, mtime in walk_files(dir, workers, errors):
+    seen.add(path)
+    if index.get(path) != (size, mtime):
+      index[path] = (size, mtime)
+      changed.append(path)
+  failed = tuple(os.path.join(subdir, '') for subdir, e in errors)  ## 'dir/sub/', so 'dir/subway' does not match
+  removed = [path for path in index if path not in seen and not path.startswith(failed)]
+  for path in removed:
+    del index[path]
+  return changed, removed, errors
+
+# shutil.copy2(src, dst) copies a file along with its mtime. On Linux it hands the copy to the kernel (os.sendfile),
+## so the data does not pass through python at all.
+# to mirror a whole tree, copy the files on a thread pool, and skip any file whose copy already has the same size and mtime --
+## copy2() gave the copy the mtime of the original, so they only differ if the original changed since.
+import shutil
+import stat
+import time
+## Copies src to dst (making dst's directories) unless dst is already up to date. Returns the bytes copied, or None if skipped.
+## Anything else at dst, like a symlink or a directory, is removed first: copy2() would write through a symlink into its target.
+def sync_file(src, dst):
+  st = os.stat(src)
+  try:
+    dst_st = os.lstat(dst)  ## lstat() looks at a symlink itself instead of following it
+  except FileNotFoundError:
+    dst_st = None
+  if dst_st is not None:
+    if stat.S_ISDIR(dst_st.st_mode):
+      shutil.rmtree(dst)
+    elif not stat.S_ISREG(dst_st.st_mode):
+      os.remove(dst)
+    elif dst_st.st_size == st.st_size and dst_st.st_mtime_ns == st.st_mtime_ns:
+      return None
+  os.makedirs(os.path.dirname(dst), exist_ok=True)
+  shutil.copy2(src, dst)
+  return st.st_size
+
+## Makes dst a symlink to the same target as the symlink src (the link itself is copied, not what it points to).
+## Returns 0, or None if dst already is that same link.
+def sync_link(src, dst):
+  target = os.readlink(src)
+  if os.path.islink(dst) and os.readlink(dst) == target:
+    return None
+  if os.path.lexists(dst):
+    os.remove(dst)
+  os.symlink(target, dst)
+  return 0
+
+## Mirrors the tree under src into dst: every directory (empty ones too), file and symlink.
+## Files and links deleted from src are not deleted from dst.
+## Directories are listed and files copied on the same thread pool, and each copy starts as soon as its directory is listed.
+## A file or directory that fails does not stop the sync: it goes into the errors list as (path, exception).
+## Returns (files and links copied, bytes copied, bytes per second, errors).
+def sync_tree(src, dst, workers=8):
+  start = time.time()
+  copied = 0
+  total = 0
+  errors = []
+  def dst_path(path):
+    return os.path.join(dst, os.path.relpath(path, src))
+  with concurrent.futures.ThreadPoolExecutor(workers) as pool:
+    pending = {pool.submit(scan_dir, src): ('dir', src)}  ## future -> what it is working on
+    while pending:
+      done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+      for future in done:
+        kind, path = pending.pop(future)
+        try:
+          result = future.result()
+          if kind == 'dir':
+            os.makedirs(dst_path(path), exist_ok=True)
+        except OSError as e:
+          errors.append((path, e))
+          continue
+        if kind == 'copy':
+          if result is not None:
+            copied += 1
+            total += result
+          continue
+        files, subdirs, links = result
+        for file in files:
+          pending[pool.submit(sync_file, file[0], dst_path(file[0]))] = ('copy', file[0])
+        for link in links:
+          pending[pool.submit(sync_link, link, dst_path(link))] = ('copy', link)
+        for subdir in subdirs:
+          pending[pool.submit(scan_dir, subdir)] = ('dir', subdir)
+  seconds = time.time() - start
+  return copied, total, total / seconds if seconds else 0.0, errors
 # in the interpreter, do an "import os", and then use these commands look at what's available in the module: dir(os), help(os.listdir), dir(os.path), help(os.path.dirname).
 
 #                                                               Running External Processes -- commands
@@ -31,13 +188,59 @@ def printdir(dir):
 ## this works if you want to run the command but do not need to capture its output into your python data structures.
 # the commands module and the popen2 module are deprecated as of Python 2.6 and removed in 3.x. The subprocess module replaces these modules https://docs.python.org/3/library/subprocess.html#subprocess-replacements
 
+# below, getstatusoutput() does the job of the old commands.getstatusoutput() with asyncio's subprocess support.
+# the command is given as a list of the program and its arguments, e.g. ['ls', '-l', dir], so no shell is involved
+## and a dir name with spaces or quotes in it can't break the command.
+# asyncio can wait on many processes at the same time, so run_commands() starts a whole list of commands at once,
+## with a semaphore to keep at most limit of them running, and returns their (status, output) tuples in the same order as cmds.
+# the output is read in pieces as the process writes it (on_output(cmd, chunk) is called with each piece if given),
+## and a process still running after timeout seconds is killed.
+import asyncio
+import subprocess
+import sys
+async def run_command(cmd, timeout=None, on_output=None):
+  try:
+    proc = await asyncio.create_subprocess_exec(*cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+  except OSError as e:  ## e.g. the program does not exist; the shell would give status 127
+    return 127, str(e)
+  chunks = []
+  async def read_output():
+    while True:
+      chunk = await proc.stdout.read(64 * 1024)
+      if not chunk:
+        break
+      chunks.append(chunk)
+      if on_output:
+        on_output(cmd, chunk)
+    return await proc.wait()
+  try:
+    status = await asyncio.wait_for(read_output(), timeout)
+  except asyncio.TimeoutError:
+    proc.kill()
+    status = await proc.wait()
+  output = b''.join(chunks).decode(errors='replace')
+  if output.endswith('\n'):  ## like getstatusoutput(), drop the trailing newline
+    output = output[:-1]
+  return status, output
+
+def run_commands(cmds, limit=16, timeout=None, on_output=None):
+  async def run_all():
+    semaphore = asyncio.Semaphore(limit)
+    async def run_one(cmd):
+      async with semaphore:
+        return await run_command(cmd, timeout, on_output)
+    return await asyncio.gather(*[run_one(cmd) for cmd in cmds])
+  return asyncio.run(run_all())
+
+def getstatusoutput(cmd, timeout=None):
+  return run_commands([cmd], 1, timeout)[0]
+
 ## Given a dir path, run an external 'ls -l' on it --
 ## shows how to call an external program
-import sys
 def listdir(dir):
-  cmd = 'ls -l ' + dir
+  cmd = ['ls', '-l', dir]
   print("Command to run:", cmd)   ## good to debug cmd before actually running it
-  (status, output) = commands.getstatusoutput(cmd)
+  (status, output) = getstatusoutput(cmd)
   if status:    ## Error case, print the command's output to stderr and exit
     sys.stderr.write(output)
     sys.exit(status)
@@ -49,19 +252,43 @@ def listdir(dir):
 # for example a run-time error might be that a variable used in the program does not have a value (ValueError .. you've probably seen that one a few times), or a file open operation error because a file does not exist (IOError)
 # without any error handling code (as we have done thus far), a run-time exception just halts the program with an error message.
 # that's a good default behavior, and you've seen it many times. You can add a "try/except" structure to your code to handle exceptions, like this:
-try:
+## Returns the text of the file, or None if it can't be read
+def read_file(filename):
+  try:
     ## Either of these two lines could throw an IOError, say
     ## if the file does not exist or the read() encounters a low level error.
-    f = open(random_filename, 'rU')
-    text = f.read()
-    f.close()
+    with open(filename, 'r') as f:
+      return f.read()
   except IOError:
     ## Control jumps directly to here if any of the above lines throws IOError.
-    sys.stderr.write('problem reading:' + random_filename)
+    sys.stderr.write('problem reading:' + filename + '\n')
   ## In any case, the code then continues with the line after the try/except
 # the try: section includes the code which might throw an exception.
 # the except: section holds the code to run if there is an exception.
 # if there is no exception, the except: section is skipped
+# to read many files, read_files() below reads them on a thread pool, and instead of stopping at the first error
+## it keeps going and collects the exception of every file that failed, so the caller can see exactly what went wrong where.
+# files bigger than mmap_size are memory mapped rather than read: the mmap object works like bytes, but the data is only
+## paged in from disk when it is looked at.
+import mmap
+## Returns (contents, errors): contents maps each readable path to its bytes (or mmap), errors maps the others to their exception
+def read_files(paths, workers=16, mmap_size=16 * 1024 * 1024):
+  def read_one(path):
+    with open(path, 'rb') as f:
+      size = os.fstat(f.fileno()).st_size
+      if size and size >= mmap_size:  ## empty files can't be mapped
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+      return f.read()
+  contents = {}
+  errors = {}
+  with concurrent.futures.ThreadPoolExecutor(workers) as pool:
+    futures = {path: pool.submit(read_one, path) for path in paths}
+    for path, future in futures.items():
+      try:
+        contents[path] = future.result()
+      except OSError as e:
+        errors[path] = e
+  return contents, errors
 
 #                                                               HTTP -- urllib.request,and urllib.parse
 # the module *urllib.request* provides url fetching -- making a url look like a file you can read from.
@@ -71,18 +298,19 @@ try:
 # urllib.error containing the exceptions raised by urllib.request
 # urllib.parse for parsing URLs
 # urllib.robotparser for parsing robots.txt files
-# ufile = urllib.urlopen(url) -- returns a file like object for that url
+# ufile = urllib.request.urlopen(url) -- returns a file like object for that url
 # text = ufile.read() -- can read from it, like a file (readlines() etc. also work)
-# info = ufile.info() -- the meta info for that request. info.gettype() is the mime type, e.g. 'text/html'
+# info = ufile.info() -- the meta info for that request. info.get_content_type() is the mime type, e.g. 'text/html'
 # baseurl = ufile.geturl() -- gets the "base" url for the request, which may be different from the original because of redirects
 # urllib.urlretrieve(url, filename) -- downloads the url data to the given file path
-# urlparse.urljoin(baseurl, url) -- given a url that may or may not be full, and the baseurl of the page it comes from, return a full url. Use geturl() above to provide the base url.
+# urllib.parse.urljoin(baseurl, url) -- given a url that may or may not be full, and the baseurl of the page it comes from, return a full url. Use geturl() above to provide the base url.
 ## Given a url, try to retrieve it. If it's text/html,
 ## print its base url and its text.
+import urllib.request
 def wget(url):
-  ufile = urllib.urlopen(url)  ## get file-like object for url
+  ufile = urllib.request.urlopen(url)  ## get file-like object for url
   info = ufile.info()   ## meta-info about the url content
-  if info.gettype() == 'text/html':
+  if info.get_content_type() == 'text/html':
     print('base url:' + ufile.geturl())
     text = ufile.read()  ## read all its text
     print(text)
@@ -92,12 +320,243 @@ def wget(url):
 ## urlopen() fails.
 def wget2(url):
   try:
-    ufile = urllib.urlopen(url)
-    if ufile.info().gettype() == 'text/html':
+    ufile = urllib.request.urlopen(url)
+    if ufile.info().get_content_type() == 'text/html':
       print(ufile.read())
   except IOError:
     print('problem reading url:', url)
 
+# to download many urls, fetch_many() below runs several downloads at the same time on a thread pool.
+# urlopen() makes a new connection for every url; with http.client each thread instead keeps one open ("keep-alive") connection per host
+## and sends all its requests for that host over it, which saves a connection setup per url.
+# each body is copied to its file in chunks as it arrives, so a big page never has to fit in memory.
+# like wget(), only text/html pages are kept. Redirects are not followed.
+import http.client
+import threading
+import urllib.parse
+## Returns this thread's connection to the host of url, making it the first time.
+## connections is a threading.local, so each thread gets its own dict of connections;
+## every new connection is also added to the opened list, so they can all be closed at the end.
+def get_connection(connections, opened, url):
+  if not hasattr(connections, 'by_host'):
+    connections.by_host = {}
+  parts = urllib.parse.urlsplit(url)
+  key = (parts.scheme, parts.netloc)
+  if key not in connections.by_host:
+    if parts.scheme == 'https':
+      connections.by_host[key] = http.client.HTTPSConnection(parts.netloc, timeout=30)
+    else:
+      connections.by_host[key] = http.client.HTTPConnection(parts.netloc, timeout=30)
+    opened.append(connections.by_host[key])
+  return connections.by_host[key]
+
+## Downloads url over conn into filename if it is a text/html page. Returns the number of bytes written, or None if the page was skipped.
+def fetch_to_file(conn, url, filename, chunk_size=64 * 1024):
+  parts = urllib.parse.urlsplit(url)
+  path = parts.path or '/'
+  if parts.query:
+    path += '?' + parts.query
+  try:
+    conn.request('GET', path)
+    response = conn.getresponse()
+  except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+    ## the server may have closed the kept-alive connection, so try once more on a new one (other errors are not retried)
+    conn.close()
+    conn.request('GET', path)
+    response = conn.getresponse()
+  if response.status != 200 or response.headers.get_content_type() != 'text/html':
+    conn.close()  ## the body is not read, so the connection can't be used again
+    return None
+  f = open(filename, 'wb')
+  try:
+    with f:
+      shutil.copyfileobj(response, f, chunk_size)
+      if response.length:  ## read() just stops if the server hangs up early; length is what the body still owed
+        raise http.client.IncompleteRead(b'', response.length)
+      return f.tell()
+  except BaseException:
+    conn.close()  ## the rest of the body is unread, so the connection can't be used again
+    os.remove(filename)  ## don't leave a partial page behind
+    raise
+
+## Downloads the text/html urls into dest_dir (made if needed) as 0.html, 1.html ... (in the order of urls).
+## Returns a list of (url, filename, bytes) tuples, with filename and bytes None for the skipped or failed urls.
+## All the connections are closed when the downloads are done.
+def fetch_many(urls, dest_dir, workers=8):
+  os.makedirs(dest_dir, exist_ok=True)
+  connections = threading.local()
+  opened = []
+  def fetch(i, url):
+    filename = os.path.join(dest_dir, '%d.html' % i)
+    try:
+      size = fetch_to_file(get_connection(connections, opened, url), url, filename)
+    except (http.client.HTTPException, OSError):
+      print('problem reading url:', url)
+      size = None
+    if size is None:
+      return url, None, None
+    return url, filename, size
+  try:
+    with concurrent.futures.ThreadPoolExecutor(workers) as pool:
+      return list(pool.map(fetch, range(len(urls)), urls))
+  finally:
+    for conn in opened:
+      conn.close()
+
+# when the same pages are fetched again and again, a local copy saves downloading them each time.
+# servers send an ETag (a version tag for the page) and/or a Last-Modified date with a page. To check whether a saved copy is still current,
+## send them back in If-None-Match / If-Modified-Since headers: if nothing changed, the server answers "304 Not Modified" with no body,
+## and urlopen() raises it as a urllib.error.HTTPError with e.code == 304.
+# the copies are kept in cache_dir as <sha1 of url>.body plus <sha1 of url>.json holding the response headers.
+# once the bodies add up to more than max_bytes, the least recently used ones are deleted.
+# several threads or processes may share one cache_dir, so a copy can vanish at any time (evicted by another one): that just means a miss.
+import hashlib
+import json
+import tempfile
+import urllib.error
+cache_stats = {'hits': 0, 'misses': 0}
+
+def cache_hit_rate():
+  total = cache_stats['hits'] + cache_stats['misses']
+  return cache_stats['hits'] / total if total else 0.0
+
+## Returns (headers, body) for url, using the copy in cache_dir when the server says it is still current.
+## headers is a dict of the response headers with the header names in lowercase (HTTP header names are case-insensitive,
+## but dict keys are not, so 'ETag', 'Etag' and 'etag' all end up as 'etag'); body is the page as bytes.
+def cached_get(url, cache_dir, max_bytes=100 * 1024 * 1024):
+  key = hashlib.sha1(url.encode()).hexdigest()
+  body_path = os.path.join(cache_dir, key + '.body')
+  headers_path = os.path.join(cache_dir, key + '.json')
+  request = urllib.request.Request(url)
+  cached_headers = None
+  if os.path.exists(body_path):
+    try:
+      with open(headers_path) as f:
+        cached_headers = json.load(f)
+    except FileNotFoundError:
+      pass
+  if cached_headers is not None:
+    if 'etag' in cached_headers:
+      request.add_header('If-None-Match', cached_headers['etag'])
+    if 'last-modified' in cached_headers:
+      request.add_header('If-Modified-Since', cached_headers['last-modified'])
+  try:
+    with urllib.request.urlopen(request) as ufile:
+      headers = {name.lower(): value for name, value in ufile.headers.items()}
+      body = ufile.read()
+  except urllib.error.HTTPError as e:
+    if e.code != 304 or cached_headers is None:
+      raise
+    try:
+      os.utime(body_path)  ## the mtime marks when the copy was last used
+      with open(body_path, 'rb') as f:
+        body = f.read()
+    except FileNotFoundError:  ## evicted since the check above, so fetch it again
+      return cached_get(url, cache_dir, max_bytes)
+    cache_stats['hits'] += 1
+    return cached_headers, body
+  cache_stats['misses'] += 1
+  if 'etag' in headers or 'last-modified' in headers:  ## without them the copy could never be checked
+    os.makedirs(cache_dir, exist_ok=True)
+    replace_file(body_path, body)
+    replace_file(headers_path, json.dumps(headers).encode())
+    evict_cache(cache_dir, max_bytes)
+  return headers, body
+
+## Writes data (bytes) to path through a temporary file in the same dir, so a crash never leaves half a file under the real name.
+## mkstemp() makes a new, unique temporary name each time, so two writers of the same copy never write into each other's file.
+def replace_file(path, data):
+  fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(path))
+  try:
+    with os.fdopen(fd, 'wb') as f:
+      f.write(data)
+    os.replace(tmp_path, path)
+  except BaseException:
+    os.remove(tmp_path)
+    raise
+
+## Deletes the least recently used copies in cache_dir until the bodies take at most max_bytes
+def evict_cache(cache_dir, max_bytes):
+  bodies = []
+  total = 0
+  with os.scandir(cache_dir) as entries:
+    for entry in entries:
+      if entry.name.endswith('.body'):
+        try:
+          st = entry.stat()
+        except FileNotFoundError:  ## already evicted by another thread or process
+          continue
+        bodies.append((st.st_mtime_ns, st.st_size, entry.path))
+        total += st.st_size
+  bodies.sort()  ## oldest first
+  for mtime, size, path in bodies:
+    if total <= max_bytes:
+      break
+    for victim in (path, path[:-len('.body')] + '.json'):
+      try:
+        os.remove(victim)
+      except FileNotFoundError:  ## already evicted by another thread or process
+        pass
+    total -= size
+
+# a small web crawler puts wget(), a regular expression and urljoin() together: fetch a page, pull out the href="..." links with a
+## compiled pattern, turn each one into a full url with urljoin() against the page's geturl(), and go on to the links not seen before.
+# the seen set makes sure each url is fetched only once. Pages are handed to the thread pool as soon as their url is found,
+## so fetching one page overlaps with reading the links out of others.
+import codecs
+import re
+LINK_RE = re.compile(r'''href=["'](.*?)["']''', re.IGNORECASE)
+## Fetches url; returns its base url and the full http(s) urls it links to, or None if it is not a text/html page
+def page_links(url):
+  with urllib.request.urlopen(url, timeout=30) as ufile:
+    info = ufile.info()
+    base = ufile.geturl()
+    if info.get_content_type() != 'text/html':
+      return None
+    charset = info.get_content_charset() or 'utf-8'
+    try:
+      codecs.lookup(charset)
+    except LookupError:  ## a charset python does not know, e.g. charset=x-bogus
+      charset = 'utf-8'
+    text = ufile.read().decode(charset, errors='replace')
+  links = []
+  for link in LINK_RE.findall(text):
+    full, fragment = urllib.parse.urldefrag(urllib.parse.urljoin(base, link))  ## page.html#top is the same page as page.html
+    if full.startswith(('http://', 'https://')):
+      links.append(full)
+  return base, links
+
+## Crawls out from start_url, fetching at most max_pages urls (nearest pages first, roughly).
+## Returns (the list of text/html pages that were crawled, those pages per second); images and other files are fetched but not counted.
+def crawl(start_url, max_pages=100, workers=8):
+  start = time.time()
+  seen = {start_url}
+  fetched = 1  ## urls handed to the pool; seen is bigger, as it also holds the urls that redirects led to
+  crawled = []
+  with concurrent.futures.ThreadPoolExecutor(workers) as pool:
+    pending = {pool.submit(page_links, start_url): start_url}
+    while pending:
+      done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+      for future in done:
+        url = pending.pop(future)
+        try:
+          page = future.result()
+        except (IOError, http.client.HTTPException, ValueError):
+          print('problem reading url:', url)
+          continue
+        if page is None:  ## not a text/html page
+          continue
+        base, links = page
+        crawled.append(url)
+        seen.add(base)  ## after a redirect, the page's real url counts as seen too
+        for link in links:
+          if link not in seen and fetched < max_pages:
+            seen.add(link)
+            fetched += 1
+            pending[pool.submit(page_links, link)] = link
+  seconds = time.time() - start
+  return crawled, len(crawled) / seconds if seconds else 0.0
+
 
 
 
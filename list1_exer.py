@@ -15,6 +15,9 @@
 # It's ok if you do not complete all the functions, and there
 # are some additional functions to try in list2.py.
 
+import heapq
+import operator
+
 # A. match_ends
 # Given a list of strings, return the count of the number of
 # strings where the string length is 2 or more and the first
@@ -27,6 +30,12 @@ def match_ends(words):
             count = count + 1
     return count
 
+# Same count for all the words of a file. The file is read one line at a time,
+# so it never has to fit in memory.
+def match_ends_file(filename):
+    with open(filename) as f:
+        return sum(match_ends(line.split()) for line in f)
+
 # B. front_x
 # Given a list of strings, return a list with the strings
 # in sorted order, except group all the strings that begin with 'x' first.
@@ -34,17 +43,28 @@ def match_ends(words):
 # ['xanadu', 'xyz', 'aardvark', 'apple', 'mix']
 # Hint: this can be done by making 2 lists and sorting each of them
 # before combining them.
-def front_x(words):
+# The words are split into the 2 lists in one pass and each list is sorted
+# once at the end (sorting inside the loop would re-sort on every append).
+# prefix= picks the letters that go first; pass a function as first= to
+# group by any other test, e.g. first=str.isupper.
+def front_x(words, prefix='x', first=None):
+    if first is None:
+        first = lambda word: word.startswith(prefix)
     only_x = []
     others = []
-    for i in words:
-        if i.startswith("x"):
-            only_x.append(i)
-            only_x.sort()
+    for word in words:
+        if first(word):
+            only_x.append(word)
         else:
-            others.append(i)
-            others.sort()
-    return only_x + others
+            others.append(word)
+    only_x.sort()
+    others.sort()
+    only_x.extend(others)
+    return only_x
+
+# Runs front_x over many word lists, e.g. one list per line of a file.
+def front_x_many(word_lists, prefix='x', first=None):
+    return [front_x(words, prefix, first) for words in word_lists]
 
 
 # C. sort_last
@@ -53,11 +73,27 @@ def front_x(words):
 # e.g. [(1, 7), (1, 3), (3, 4, 5), (2, 2)] yields
 # [(2, 2), (1, 3), (3, 4, 5), (1, 7)]
 # Hint: use a custom key= function to extract the last element form each tuple.
-def MyFn(s):
-    return s[-1]
+# operator.itemgetter(-1) does the same as "def MyFn(s): return s[-1]",
+# but the lookup runs in C instead of calling a python function per tuple.
+last = operator.itemgetter(-1)
+
 def sort_last(tuples):
+    return sorted(tuples, key=last)
+
+# Same as sort_last, but sorts the passed in list in place (no new list).
+def sort_last_inplace(tuples):
+    tuples.sort(key=last)
+    return tuples
 
-    return sorted(tuples, key = MyFn)
+# Only the k tuples with the smallest last element, in order. heapq.nsmallest
+# keeps just k tuples around instead of sorting the whole list.
+def sort_last_top(tuples, k):
+    return heapq.nsmallest(k, tuples, key=last)
+
+# Sorts by several positions at once, e.g. sort_by(tuples, -1, 0) sorts by the
+# last element and then by the first one. Like sorted(), the sort is stable.
+def sort_by(tuples, *indexes):
+    return sorted(tuples, key=operator.itemgetter(*indexes))
 
 
 # Simple provided test() function used in main() to print
@@ -85,6 +121,10 @@ def main():
          ['xaa', 'xcc', 'aaa', 'bbb', 'ccc'])
     test(front_x(['mix', 'xyz', 'apple', 'xanadu', 'aardvark']),
          ['xanadu', 'xyz', 'aardvark', 'apple', 'mix'])
+    test(front_x(['bob', 'ann', 'ben'], prefix='b'), ['ben', 'bob', 'ann'])
+    test(front_x(['b', 'A', 'c', 'B'], first=str.isupper), ['A', 'B', 'b', 'c'])
+    test(front_x_many([['mix', 'xyz'], [], ['b', 'xa']]),
+         [['xyz', 'mix'], [], ['xa', 'b']])
 
     print
     print('sort_last')
@@ -94,6 +134,12 @@ def main():
          [(3, 1), (1, 2), (2, 3)])
     test(sort_last([(1, 7), (1, 3), (3, 4, 5), (2, 2)]),
          [(2, 2), (1, 3), (3, 4, 5), (1, 7)])
+    test(sort_last_inplace([(1, 3), (3, 2), (2, 1)]),
+         [(2, 1), (3, 2), (1, 3)])
+    test(sort_last_top([(1, 7), (1, 3), (3, 4, 5), (2, 2)], 2),
+         [(2, 2), (1, 3)])
+    test(sort_by([(2, 1), (1, 2), (1, 1)], -1, 0),
+         [(1, 1), (2, 1), (1, 2)])
 
 
 if __name__ == '__main__':
@@ -108,6 +108,10 @@ def MyFn(s):
 ## Now pass key=MyFn to sorted() to sort by the last letter:
 print(sorted(strs, key=MyFn))  ## ['wa', 'zb', 'xc', 'yd']
 # to use key= custom sorting, remember that you provide a function that takes one value and returns the proxy value to guide the sorting.
+# for simple keys like "the last element", operator.itemgetter() builds the key function for you, and it runs faster than a python def:
+import operator
+print(sorted(strs, key=operator.itemgetter(-1)))  ## ['wa', 'zb', 'xc', 'yd']
+# itemgetter can take several indexes, e.g. itemgetter(-1, 0) sorts by the last element and then by the first one.
 
 #                                                                                  Sort() method
 # the sort() method on a list sorts that list into ascending order, e.g. list.sort()
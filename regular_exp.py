@@ -3,7 +3,12 @@
 # the re.search() method takes a regular expression pattern and a string and searches for that pattern within the string.
 # if the search is successful, search() returns a match object or None otherwise.
 # therefore, the search is usually immediately followed by an if-statement to test if the search succeeded:
+import concurrent.futures
+import functools
+import mmap
+import os
 import re
+import string
 str = 'an example word:cat!!'
 match = re.search(r'word:\w\w\w', str)
 # if-statement after search() tests if it succeeded
@@ -13,6 +18,30 @@ else:
   print('did not find')
 # the 'r' at the start of the pattern string designates a python "raw" string which passes through backslashes without change which is very handy for regular expressions (Java needs this feature badly!).
 
+#                                                      Compiled Patterns
+# every re.search(pat, str) call has to turn the pattern string into a pattern object first.
+# the re module keeps a small cache of these, but when many different patterns are used the cache fills up and patterns get compiled again.
+# re.compile(pat) does the work once and returns a pattern object with the same search(), findall(), finditer() and sub() methods.
+# the patterns used in this file are compiled once here and looked up by name:
+PATTERNS = {
+    'word': re.compile(r'word:\w\w\w'),
+    'email': re.compile(r'[\w\.-]+@[\w\.-]+'),
+    'email_groups': re.compile(r'([\w\.-]+)@([\w\.-]+)'),  ## group(1) is the username, group(2) the host
+    'tag': re.compile(r'(<.*?>)'),
+}
+EMAIL_RE = PATTERNS['email']
+EMAIL_GROUPS_RE = PATTERNS['email_groups']
+TAG_RE = PATTERNS['tag']
+# for patterns that only show up at run time (e.g. typed in by a user), get_pattern() compiles each one once and keeps the last 256 in its own cache.
+# get_pattern.cache_info() reports the hits and misses of that cache.
+@functools.lru_cache(maxsize=256)
+def get_pattern(pat, flags=0):
+  return re.compile(pat, flags)
+match = PATTERNS['word'].search(str)
+print(match.group())  ## word:cat
+print(get_pattern(r'\w+:').search(str).group())  ## word:
+print(get_pattern.cache_info())  ## CacheInfo(hits=0, misses=1, maxsize=256, currsize=1)
+
 #                                                      Basic Patterns
 # the most basic patterns which match single chars:
 # a, X, 9, < -- ordinary characters just match themselves exactly. The meta-characters which do not match themselves because they have special meanings are: . ^ $ * + ? { [ ] \ | ( ) (details below)
@@ -111,7 +140,7 @@ if match:
 ## Suppose we have a text with many email addresses
 str = 'purple alice@google.com, blah monkey bob@abc.com blah dishwasher'
 ## Here re.findall() returns a list of all the found email strings
-emails = re.findall(r'[\w\.-]+@[\w\.-]+', str)
+emails = EMAIL_RE.findall(str)
 for email in emails:
 # do something with each found email string
     print(email) ## ['alice@google.com', 'bob@abc.com']
@@ -122,6 +151,54 @@ for email in emails:
 # f = open('randomfileidk.txt', 'r')
 ## Feed the file text into findall(); it returns a list of all the found strings
 # strings = re.findall(r'random pattern idk', f.read())
+# f.read() pulls the whole file into memory though, which does not work for a log file of many gigabytes.
+# the mmap module can map the file into memory instead: the operating system pages the data in as the pattern walks over it.
+# the mapped file holds bytes rather than a str, so the pattern has to be a bytes pattern too (rb'...' instead of r'...').
+# note that in a bytes pattern \w only matches the ASCII letters, digits and _, so iter_emails() only finds ASCII addresses:
+## for 'josé@exämple.com' the str pattern EMAIL_GROUPS_RE finds ('josé', 'exämple.com'), but iter_emails() finds nothing.
+## for text with non-ASCII addresses, decode it and use EMAIL_GROUPS_RE.finditer() on the str instead.
+# finditer() is the lazy version of findall(): it returns one match object at a time instead of building the whole list.
+EMAIL_BYTES_RE = re.compile(rb'([\w\.-]+)@([\w\.-]+)')
+EMAIL_CHARS = frozenset((string.ascii_letters + string.digits + '_.-@').encode())
+## Yields (offset, username, host) for every email address in the file.
+## Files that can't be mapped (empty files, pipes) are read in chunks instead.
+def iter_emails(filename, chunk_size=1024 * 1024):
+  with open(filename, 'rb') as f:
+    try:
+      data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (ValueError, OSError):
+      data = None
+    if data is not None:
+      with data:
+        for match in EMAIL_BYTES_RE.finditer(data):
+          yield match.start(), match.group(1).decode(), match.group(2).decode()
+      return
+    offset = 0  ## file offset of buf[0]
+    buf = b''
+    while True:
+      chunk = f.read(chunk_size)
+      buf += chunk
+      if chunk:
+        ## an address may run past the end of this chunk, so keep the last
+        ## word back and scan it again together with the next chunk
+        end = email_tail_start(buf)
+      else:
+        end = len(buf)
+      for match in EMAIL_BYTES_RE.finditer(buf, 0, end):
+        yield offset + match.start(), match.group(1).decode(), match.group(2).decode()
+      offset += end
+      buf = buf[end:]
+      if not chunk:
+        break
+
+## Index where the trailing run of email characters in buf starts.
+def email_tail_start(buf):
+  i = len(buf)
+  while i > 0 and buf[i - 1] in EMAIL_CHARS:
+    i -= 1
+  return i
+# for offset, user, host in iter_emails('randomfileidk.txt'):
+#   print(offset, user, host)
 
 #                                                       findall and Groups
 # the parenthesis ( ) group mechanism can be combined with findall().
@@ -129,7 +206,7 @@ for email in emails:
 # each tuple represents one match of the pattern, and inside the tuple is the group(1), group(2) .. data.
 # so if 2 parenthesis groups are added to the email pattern, then findall() returns a list of tuples, each length 2 containing the username and host, e.g. ('alice', 'google.com').
 str = 'purple alice@google.com, blah monkey bob@abc.com blah dishwasher'
-tuples = re.findall(r'([\w\.-]+)@([\w\.-]+)', str)
+tuples = EMAIL_GROUPS_RE.findall(str)
 print(tuples)  ## [('alice', 'google.com'), ('bob', 'abc.com')]
 for tuple in tuples:
     print(tuple[0])  ## username
@@ -160,9 +237,79 @@ for tuple in tuples:
 str = 'purple alice@google.com, blah monkey bob@abc.com blah dishwasher'
 ## re.sub(pat, replacement, str) -- returns new string with all replacements,
 ## \1 is group(1), \2 group(2) in the replacement
-print(re.sub(r'([\w\.-]+)@([\w\.-]+)', r'\1@yo-yo-dyne.com', str))
+print(EMAIL_GROUPS_RE.sub(r'\1@yo-yo-dyne.com', str))
 ## purple alice@yo-yo-dyne.com, blah monkey bob@yo-yo-dyne.com blah dishwasher
 
+#                                                       Many Patterns in One Pass (optional)
+# running one search per pattern means reading the same text once for every pattern.
+# instead, the patterns can be joined with | into one big pattern, with each one put in a named group (?P<name>...).
+# a single finditer() pass then finds the hits of all of them, and match.lastgroup tells which pattern matched.
+# at each position the alternatives are tried from left to right, so when two patterns could match at the same place the earlier one wins,
+# and the text it matched is not looked at again by the others.
+# a compiled pattern keeps its flags (e.g. re.IGNORECASE) in pat.flags; they are carried over into a scoped flags group (?i:...)
+## around that pattern only, so they don't leak into the others.
+# for a verbose (re.VERBOSE) pattern the group is closed on a new line: the pattern may end in a # comment, which would otherwise swallow the ')'.
+# joining renumbers the groups, so a numbered backreference like \1 would point at the wrong group: such patterns are refused
+## with a ValueError (use a named group and (?P=name) instead).
+FLAG_LETTERS = [(re.IGNORECASE, 'i'), (re.MULTILINE, 'm'), (re.DOTALL, 's'), (re.VERBOSE, 'x'), (re.ASCII, 'a')]
+NUMBERED_BACKREF_RE = re.compile(r'(?:^|[^\\])(?:\\\\)*\\[1-9]|\(\?\(\d')
+## named is a dict of name -> pattern (a string or a compiled pattern)
+def combine_patterns(named):
+  parts = []
+  for name, pat in named.items():
+    text = getattr(pat, 'pattern', pat)
+    if NUMBERED_BACKREF_RE.search(text):
+      raise ValueError('pattern %r uses a numbered group reference' % name)
+    flags = ''.join(letter for flag, letter in FLAG_LETTERS if getattr(pat, 'flags', 0) & flag)
+    if 'x' in flags:
+      text = '(?%s:%s\n)' % (flags, text)
+    elif flags:
+      text = '(?%s:%s)' % (flags, text)
+    parts.append('(?P<%s>%s)' % (name, text))
+  return re.compile('|'.join(parts))
+
+## Yields (name, matched text) for every hit of the combined pattern.
+def iter_tagged(combined, text):
+  for match in combined.finditer(text):
+    yield match.lastgroup, match.group()
+COMBINED_RE = combine_patterns({'word': PATTERNS['word'], 'digits': r'\d+',
+                                'email': EMAIL_RE, 'tag': TAG_RE,
+                                'price': re.compile(r'\$ \d+  # a dollar sign, then digits', re.VERBOSE)})
+print(list(iter_tagged(COMBINED_RE, 'word:cat <b>bob@abc.com</b> 42 $10')))
+## [('word', 'word:cat'), ('tag', '<b>'), ('email', 'bob@abc.com'), ('tag', '</b>'), ('digits', '42'), ('price', '$10')]
+
+#                                                       Parallel findall and sub (optional)
+# findall() and sub() run on one CPU core. For a big text, the work can be shared out over several processes with concurrent.futures.ProcessPoolExecutor.
+# the text is cut into pieces that end at a line break, so this only works for patterns that never match across lines (like the email pattern).
+# pool.map() hands back the results in the same order as the pieces, so the output is the same as for the single-process call.
+# compiled patterns can be sent to the worker processes, so pattern.findall and pattern.sub are passed to map() directly.
+## Cuts text into pieces of about size chars, each ending with a '\n' (except maybe the last).
+def split_lines(text, size):
+  pieces = []
+  start = 0
+  while start < len(text):
+    end = text.find('\n', start + size)
+    end = len(text) if end == -1 else end + 1
+    pieces.append(text[start:end])
+    start = end
+  return pieces
+
+def parallel_findall(pattern, text, workers=None):
+  pieces = split_lines(text, max(1, len(text) // ((workers or os.cpu_count()) * 4)))
+  with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+    return [found for part in pool.map(pattern.findall, pieces) for found in part]
+
+## Returns the new string, or writes it piece by piece to out (e.g. an open file) if given.
+def parallel_sub(pattern, repl, text, workers=None, out=None):
+  pieces = split_lines(text, max(1, len(text) // ((workers or os.cpu_count()) * 4)))
+  with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+    results = pool.map(functools.partial(pattern.sub, repl), pieces)
+    if out is None:
+      return ''.join(results)
+    out.writelines(results)
+# tuples = parallel_findall(EMAIL_GROUPS_RE, big_text)
+# new_text = parallel_sub(EMAIL_GROUPS_RE, r'\1@yo-yo-dyne.com', big_text)
+
 
 
 
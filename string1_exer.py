@@ -23,11 +23,14 @@
 # instead of the actual count.
 # So donuts(5) returns 'Number of donuts: 5'
 # and donuts(23) returns 'Number of donuts: many'
+DONUTS = "Number of donuts: "
+MANY_DONUTS = DONUTS + "many"
+
 def donuts(count):
     if count < 10:
-        return("Number of donuts: " + str(count))
+        return(DONUTS + str(count))
     else:
-        return("Number of donuts: many")
+        return(MANY_DONUTS)
 
 
 # B. both_ends
@@ -58,6 +61,22 @@ def fix_start(s):
     replacer = other_characters.replace(first_character, "*")
     return first_character + replacer
 
+# For a text too big to hold in memory, fix_start_chunks() takes the text as
+# a series of pieces (e.g. blocks read from a file) and yields the fixed pieces.
+# The first char is taken from the first piece and then replaced in every
+# piece after it. Works the same for str pieces and for bytes pieces.
+def fix_start_chunks(chunks):
+    first_character = None
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if first_character is None:
+            first_character = chunk[:1]  # chunk[:1] and not chunk[0], so bytes give bytes
+            star = "*" if isinstance(chunk, str) else b"*"
+            yield first_character + chunk[1:].replace(first_character, star)
+        else:
+            yield chunk.replace(first_character, star)
+
 
 # D. MixUp
 # Given strings a and b, return a single string with a and b separated
@@ -75,6 +94,23 @@ def mix_up(a, b):
 print(mix_up("a", "b"))
 
 
+# Batch versions of the functions above: each one takes a list (or any
+# iterable) of inputs and returns the list of results, doing the work
+# inline in a single list comprehension instead of one function call per item.
+def donuts_many(counts):
+    return [DONUTS + str(count) if count < 10 else MANY_DONUTS for count in counts]
+
+def both_ends_many(strs):
+    return [s[:2] + s[-2:] if len(s) >= 2 else "" for s in strs]
+
+def fix_start_many(strs):
+    return [s[0] + s[1:].replace(s[0], "*") for s in strs]
+
+# pairs is a list of (a, b) tuples
+def mix_up_many(pairs):
+    return [b[:2] + a[2:] + " " + a[:2] + b[2:] for a, b in pairs]
+
+
 # Provided simple test() function used in main() to print
 # what each function returns vs. what it's supposed to return.
 def test(got, expected):
@@ -116,6 +152,19 @@ def main():
     test(mix_up('gnash', 'sport'), 'spash gnort')
     test(mix_up('pezzy', 'firm'), 'fizzy perm')
 
+    print
+    print('batch versions')
+    counts = [4, 9, 10, 99]
+    test(donuts_many(counts), [donuts(count) for count in counts])
+    strs = ['spring', 'Hello', 'a', 'xyz', '']
+    test(both_ends_many(strs), [both_ends(s) for s in strs])
+    strs = ['babble', 'aardvark', 'google', 'donut', 'x']
+    test(fix_start_many(strs), [fix_start(s) for s in strs])
+    test(''.join(fix_start_chunks(['', 'ba', 'b', 'ble'])), 'ba**le')
+    test(b''.join(fix_start_chunks([b'aa', b'rdvark'])), b'a*rdv*rk')
+    pairs = [('mix', 'pod'), ('dog', 'dinner'), ('gnash', 'sport')]
+    test(mix_up_many(pairs), [mix_up(a, b) for a, b in pairs])
+
 
 # Standard boilerplate to call the main() function.
 if __name__ == '__main__':
@@ -15,7 +15,7 @@
 # add 'ly' instead.
 # If the string length is less than 3, leave it unchanged.
 # Return the resulting string.
-import symtable
+import functools
 
 
 def verbing(s):
@@ -34,10 +34,24 @@ def verbing(s):
     # adding_ly = s.endswith("ing") +"ly"
     #return adding_ly
   if len(s) >= 3:
-    if s[-3:] != 'ing': s = s + 'ing'
-    else: s = s + 'ly'
+    if s.endswith('ing'): s = s + 'ly'
+    else: s = s + 'ing'
   return s
 
+# Vocabularies repeat the same words a lot, so cached_verbing() remembers the
+# results for the last 65536 different words it was given;
+# cached_verbing.cache_info() shows the hits and misses.
+@functools.lru_cache(maxsize=65536)
+def cached_verbing(s):
+  return verbing(s)
+
+# verbing() for a whole list (column) of words at once: each different word
+# is worked out only once, then the results are looked up in order.
+def verbing_many(words):
+  words = list(words)
+  results = {word: cached_verbing(word) for word in set(words)}
+  return [results[word] for word in words]
+
 
 # E. not_bad
 # Given a string, find the first appearance of the
@@ -55,6 +69,59 @@ def not_bad(s):
     return s
   return s
 
+# not_bad() only looks at the first 'not' and the first 'bad'. not_bad_all()
+# rewrites every 'not'...'bad' in one pass from left to right: each 'not' is
+# matched with the nearest 'bad' after it (like the regular expression
+# r'not.*?bad' with re.DOTALL), and the search goes on after that 'bad'.
+def not_bad_all(s):
+  return ''.join(not_bad_chunks([s]))
+
+# Same for a text that comes in pieces (e.g. blocks read from a file): yields
+# the rewritten text piece by piece, and each piece is searched only once.
+# The last 2 chars of a piece may be the start of a 'not', so they are held
+# back and joined with the next piece. Once a 'not' is found, the text from
+# it on can't be written out until we know whether a 'bad' follows (then it
+# all becomes 'good') or not (then it stays as it is), so it is kept as a
+# list of pieces and only the new pieces are searched for the 'bad' -- which
+# means a 'not' that never meets a 'bad' holds everything after it in memory
+# until the end of the text.
+def not_bad_chunks(chunks):
+  waiting = []  # the pieces from an unmatched 'not' on
+  edge = ''     # the last 2 chars of the waiting pieces ('bad' may start there)
+  tail = ''     # the held back last 2 chars when nothing is waiting
+  for chunk in chunks:
+    out = []
+    if waiting:
+      b_second = (edge + chunk).find("bad")
+      if b_second == -1:
+        waiting.append(chunk)
+        edge = (edge + chunk)[-2:]
+        yield ''
+        continue
+      out.append("good")
+      waiting = []
+      chunk = chunk[b_second + 3 - len(edge):]
+    text = tail + chunk
+    pos = 0
+    while True:
+      a_first = text.find("not", pos)
+      if a_first == -1:
+        keep = max(pos, len(text) - 2)
+        out.append(text[pos:keep])
+        tail = text[keep:]
+        break
+      b_second = text.find("bad", a_first + 3)
+      out.append(text[pos:a_first])
+      if b_second == -1:
+        waiting = [text[a_first:]]
+        edge = text[-2:]
+        tail = ''
+        break
+      out.append("good")
+      pos = b_second + 3
+    yield ''.join(out)
+  yield ''.join(waiting) + tail
+
 
 # F. front_back
 # Consider dividing a string into two halves.
@@ -74,6 +141,27 @@ def front_back(a, b):
     front_b, back_b = split(b)
     return front_a + front_b + back_a + back_b
 
+# front_back() makes 4 new strings for the halves and then more while adding
+# them up. For big bytes payloads, front_back_bytes() copies the 4 halves
+# straight into one bytearray of the final size instead: memoryview slices
+# point into a and b without copying them.
+# half + rem from divmod() is the length of the front half (the extra char
+# goes in the front).
+def front_back_bytes(a, b):
+    half_a = sum(divmod(len(a), 2))
+    half_b = sum(divmod(len(b), 2))
+    out = bytearray(len(a) + len(b))
+    with memoryview(out) as view, memoryview(a) as view_a, memoryview(b) as view_b:
+        pos = 0
+        for part in (view_a[:half_a], view_b[:half_b], view_a[half_a:], view_b[half_b:]):
+            view[pos:pos + len(part)] = part
+            pos += len(part)
+    return out
+
+# pairs is a list of (a, b) tuples of bytes
+def front_back_many(pairs):
+    return [front_back_bytes(a, b) for a, b in pairs]
+
 
 
 
@@ -94,6 +182,8 @@ def main():
     test(verbing('hail'), 'hailing')
     test(verbing('swiming'), 'swimingly')
     test(verbing('do'), 'do')
+    test(verbing_many(['hail', 'do', 'hail', 'swiming']),
+         ['hailing', 'do', 'hailing', 'swimingly'])
 
     print
     print('not_bad')
@@ -101,12 +191,17 @@ def main():
     test(not_bad('This dinner is not that bad!'), 'This dinner is good!')
     test(not_bad('This tea is not hot'), 'This tea is not hot')
     test(not_bad("It's bad yet not"), "It's bad yet not")
+    test(not_bad_all('not bad, not so bad, bad not'), 'good, good, bad not')
+    test(''.join(not_bad_chunks(['This is n', 'ot that b', 'ad!'])), 'This is good!')
 
     print
     print('front_back')
     test(front_back('abcd', 'xy'), 'abxcdy')
     test(front_back('abcde', 'xyz'), 'abcxydez')
     test(front_back('Kitten', 'Donut'), 'KitDontenut')
+    test(front_back_bytes(b'abcde', b'xyz'), bytearray(b'abcxydez'))
+    test(front_back_many([(b'abcd', b'xy'), (b'', b'a')]),
+         [bytearray(b'abxcdy'), bytearray(b'a')])
 
 
 if __name__ == '__main__':
@@ -0,0 +1,64 @@
+#                                                               Word Count helpers
+# the file reading and word counting helpers of the "Files" and "Word Count" sections of Dicts_Files.py.
+# they live in their own module, with no top-level code, because word_counts_many() runs word_counts() in worker processes:
+# with the spawn and forkserver start methods each worker imports the module word_counts() comes from,
+# and importing Dicts_Files.py would run (and print) the whole tutorial again in every worker.
+import bz2
+import collections
+import concurrent.futures
+import gzip
+
+## Opens filename for reading text, decompressing .gz and .bz2 files on the fly
+def open_text(filename, buffer_size=1024 * 1024):
+    if filename.endswith('.gz'):
+        return gzip.open(filename, 'rt')
+    if filename.endswith('.bz2'):
+        return bz2.open(filename, 'rt')
+    return open(filename, 'r', buffering=buffer_size)
+
+## Yields the lines of the file one at a time; each line still ends with its '\n'
+def iter_lines(filename):
+    with open_text(filename) as f:
+        for line in f:  ## iterates over the lines of the file
+            yield line
+
+## Returns a Counter of the whitespace-separated words in the file
+def word_counts(filename):
+    counts = collections.Counter()
+    for line in iter_lines(filename):
+        counts.update(line.split())
+    return counts
+
+# several files can be counted at the same time in separate processes; adding Counters together (+=) merges their counts.
+def word_counts_many(filenames, workers=None):
+    total = collections.Counter()
+    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        for counts in pool.map(word_counts, filenames):
+            total += counts
+    return total
+
+# to get the most common words there's no need to sort the whole dict:
+# counts.most_common(n) keeps the n biggest counts in a small heap (heapq.nlargest) and returns them as (word, count) tuples.
+def top_words(counts, n):
+    return counts.most_common(n)
+
+# counting a big corpus takes a while, so the counts can be saved to a file and queried later without reading the corpus again.
+# the file has one "word<tab>count" line per word, most common first, so the top n words are simply its first n lines.
+# a filename ending in .gz is written gzip-compressed (open_text() reads it back).
+def save_counts(counts, filename):
+    if filename.endswith('.gz'):
+        f = gzip.open(filename, 'wt')
+    else:
+        f = open(filename, 'w')
+    with f:
+        f.writelines('%s\t%d\n' % (word, count) for word, count in counts.most_common())
+
+## Reads back the first n (word, count) tuples of a saved file, or all of them if n is None
+def load_counts(filename, n=None):
+    counts = []
+    for line in iter_lines(filename):
+        if n is not None and len(counts) >= n:
+            break
+        word, count = line.rstrip('\n').split('\t')
+        counts.append((word, int(count)))
+    return counts